@@ -0,0 +1,63 @@
+import sys
+import itertools
+import numpy as np
+from sim_env.parking_env import Parking, BatchedParking
+
+num_steps = 2000
+seed = 0
+atol = 1e-3
+
+
+def check_parity(env_config, steps: int) -> int:
+    """
+    Step Parking and BatchedParking(num_envs=1) with the same seed and actions and compare their results
+
+    Parameters:
+        env_config: contains the action type, render mode and parking type
+        steps (int): the number of calls to step
+
+    Return:
+        int: the number of steps whose state, reward, terminated or truncated differ
+    """
+    env = Parking(env_config)
+    batched_env = BatchedParking(env_config, num_envs=1)
+    state, _ = env.reset(seed=seed)
+    batched_state, _ = batched_env.reset(seed=seed)
+    batched_env.action_space.seed(seed)
+    mismatches = 0 if np.allclose(state, batched_state[0], atol=atol) else 1
+
+    for _ in range(steps):
+        actions = batched_env.action_space.sample()
+        state, reward, terminated, truncated, _ = env.step(actions[0])
+        batched_state, batched_reward, batched_terminated, batched_truncated, info = batched_env.step(actions)
+        if terminated or truncated:
+            # BatchedParking has already started the next episode, its last state is in the info
+            final_state = info["final_observation" if "final_observation" in info else "final_obs"][0]
+        else:
+            final_state = batched_state[0]
+
+        if (not np.allclose(state, final_state, atol=atol) or abs(reward - batched_reward[0]) > atol
+                or terminated != batched_terminated[0] or truncated != batched_truncated[0]):
+            mismatches += 1
+
+        if terminated or truncated:
+            state, _ = env.reset()
+            if not np.allclose(state, batched_state[0], atol=atol):
+                mismatches += 1
+    env.close()
+    batched_env.close()
+    return mismatches
+
+
+if __name__ == "__main__":
+    failed = False
+    for parking_type, action_type, training_mode in itertools.product(["parallel", "perpendicular"],
+                                                                      ["continuous", "discrete"], ["on", "off"]):
+        env_config = {"render_mode": "no_render",
+                      "action_type": action_type,
+                      "parking_type": parking_type,
+                      "training_mode": training_mode}
+        mismatches = check_parity(env_config, num_steps)
+        failed = failed or mismatches > 0
+        print(f"{parking_type}, {action_type}, training mode {training_mode}: {mismatches} mismatches")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,47 @@
+import time
+import functools
+import gymnasium as gym
+from sim_env.parking_env import make_parking, BatchedParking
+
+env_config = {"render_mode": "no_render",
+              "action_type": "continuous",
+              "parking_type": "perpendicular",
+              "training_mode": "on"}
+
+num_envs = 8
+num_steps = 2000
+seed = 0
+
+
+def benchmark(envs, steps: int) -> float:
+    """
+    Step the environments with random actions and measure the throughput
+
+    Parameters:
+        envs: a single environment or a vectorized environment
+        steps (int): the number of calls to step
+
+    Return:
+        float: environment steps per second
+    """
+    num = getattr(envs, "num_envs", 1)
+    envs.reset(seed=seed)
+    envs.action_space.seed(seed)
+    start_time = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = envs.step(envs.action_space.sample())
+        # a single environment has to be reset manually, vectorized ones reset automatically
+        if num == 1 and (terminated or truncated):
+            envs.reset()
+    elapsed = time.perf_counter() - start_time
+    envs.close()
+    return steps * num / elapsed
+
+
+if __name__ == "__main__":
+    env_fns = [functools.partial(make_parking, env_config)] * num_envs
+
+    print(f"Single env: {benchmark(make_parking(env_config), num_steps):.0f} steps/s")
+    print(f"SyncVectorEnv({num_envs}): {benchmark(gym.vector.SyncVectorEnv(env_fns), num_steps):.0f} steps/s")
+    print(f"AsyncVectorEnv({num_envs}): {benchmark(gym.vector.AsyncVectorEnv(env_fns), num_steps):.0f} steps/s")
+    print(f"BatchedParking({num_envs}): {benchmark(BatchedParking(env_config, num_envs), num_steps):.0f} steps/s")
@@ -1,8 +1,37 @@
 import numpy as np
+import numba as nb
 from sim_env.com_fcn import draw_object
 from sim_env.parameters import CAR_L, VELOCITY_LIMIT, CAR_STRUCT, DT, WHEEL_STRUCT, WHEEL_POS
 
 
+@nb.njit(cache=True, fastmath=True)
+def kinematic_step(car_loc, psi, v, action, dt):
+    """
+    Calculate the movement of N cars at once with the kinematic bicycle model, see Car.kinematic_act
+
+    Parameters:
+        car_loc (np.ndarray): (N, 2) the center of the cars
+        psi (np.ndarray): (N,) the heading angles of the cars
+        v (np.ndarray): (N,) the velocities of the cars
+        action (np.ndarray): (N, 2) [a, δ]: a is acceleration, δ(delta) is steering angle.
+        dt (float): the time step
+
+    Returns:
+        np.ndarray: (N, 2) the new center, (N,) the new heading angle and (N,) the new velocity of the cars
+    """
+    x_dot = v * np.cos(psi)
+    y_dot = v * np.sin(psi)
+    v_dot = action[:, 0]
+    psi_dot = v * np.tan(action[:, 1]) / CAR_L
+
+    new_car_loc = np.empty(car_loc.shape)
+    new_car_loc[:, 0] = car_loc[:, 0] + dt * x_dot
+    new_car_loc[:, 1] = car_loc[:, 1] + dt * y_dot
+    new_v = np.minimum(np.maximum(v + v_dot, -VELOCITY_LIMIT), VELOCITY_LIMIT)
+    new_psi = psi + dt * psi_dot
+    return new_car_loc, new_psi, new_v
+
+
 class Car:
     def __init__(self, car_loc, psi):
         self.car_loc = car_loc
@@ -26,19 +55,29 @@ class Car:
         v_dot = a
         psi_dot = v * np.tan(delta) / CAR_L
         """
-        x_dot = self.v * np.cos(self.psi)
-        y_dot = self.v * np.sin(self.psi)
-        v_dot = action[0]
-        psi_dot = self.v * np.tan(action[1]) / CAR_L
-        car_loc = np.array([x_dot, y_dot])
-        self.update_state(car_loc, v_dot, psi_dot, DT)
+        car_loc, psi, v = kinematic_step(self.car_loc[None, :], np.array([self.psi]), np.array([self.v]),
+                                         np.asarray(action)[None, :], DT)
+        self.car_loc[:] = car_loc[0]
+        self.psi = psi[0]
+        self.v = v[0]
         self.delta = action[1]
         self.car_vertices = self.calc_car_vertices()
 
-    def update_state(self, car_loc, v_dot, psi_dot, dt):
-        self.car_loc += dt * car_loc
-        self.v = np.clip(self.v + v_dot, -VELOCITY_LIMIT, VELOCITY_LIMIT)
-        self.psi += dt * psi_dot
+    @staticmethod
+    def kinematic_act_batched(car_loc, psi, v, actions):
+        """
+        Calculate the movement of N cars, see kinematic_step
+
+        Parameters:
+            car_loc (np.ndarray): (N, 2) the center of the cars
+            psi (np.ndarray): (N,) the heading angles of the cars
+            v (np.ndarray): (N,) the velocities of the cars
+            actions (np.ndarray): (N, 2) [a, δ] of each car
+
+        Returns:
+            np.ndarray: (N, 2) the new center, (N,) the new heading angle and (N,) the new velocity of the cars
+        """
+        return kinematic_step(car_loc, psi, v, actions, DT)
 
     @staticmethod
     def rotate_car(car_loc, angle=0.0) -> np.array:
@@ -52,9 +91,10 @@ class Car:
         Returns:
             np.array: Rotated vertices.
         """
+        c, s = np.cos(angle), np.sin(angle)
         r = np.array([
-            [np.cos(angle), -np.sin(angle)],
-            [np.sin(angle), np.cos(angle)],
+            [c, -s],
+            [s, c],
         ])
         return (r @ car_loc.T).T
 
@@ -1,5 +1,5 @@
 import pygame
-from sim_env.parameters import PIXEL_TO_METER_SCALE, COLORS
+from sim_env.parameters import PIXEL_TO_METER_SCALE, COLORS, WINDOW_H
 
 
 def meters_to_pixels(meters):
@@ -15,6 +15,24 @@ def meters_to_pixels(meters):
     return meters / PIXEL_TO_METER_SCALE
 
 
+def meters_to_screen(points):
+    """
+    Convert points in meters to screen pixels.
+
+    The y axis of the simulation points up while the screen rows go down, so the y coordinate is mirrored
+    here instead of flipping the whole rendered frame.
+
+    Parameters:
+        points: (..., 2) array of x, y values in meters.
+
+    Returns:
+        np.ndarray: (..., 2) array of the screen coordinates in pixels.
+    """
+    pixels = meters_to_pixels(points)
+    pixels[..., 1] = (WINDOW_H - 1) - pixels[..., 1]
+    return pixels
+
+
 def draw_object(screen, color, vertex):
-    pixel_vertex = meters_to_pixels(vertex)
-    pygame.draw.polygon(screen, COLORS[color], pixel_vertex)
+    pixel_vertex = meters_to_screen(vertex)
+    pygame.draw.polygon(screen, COLORS[color], pixel_vertex.tolist())
@@ -1,8 +1,7 @@
 import numpy as np
-import random
 
 
-def set_init_position(side: int, parking_type: str, randomized=True):
+def set_init_position(side: int, parking_type: str, rng: np.random.Generator, randomized=True):
     """
     Set the initial car location, parking lot location and heading angle for the training
 
@@ -17,6 +16,8 @@ def set_init_position(side: int, parking_type: str, randomized=True):
             - 3: the parking lot is placed on the left side
             - 4: the parking lot is placed on the right side
 
+        rng (np.random.Generator): the random number generator of the environment
+
         num_dict (int): a number randomly selected for the initial position
 
         Returns:
@@ -34,21 +35,21 @@ def set_init_position(side: int, parking_type: str, randomized=True):
             init_dist = 7.5  # random.uniform(7.5, 15)
 
             if side == 1:
-                x_car = init_parking_lot[0] + random.uniform(-5, 5)
+                x_car = init_parking_lot[0] + rng.uniform(-5, 5)
                 y_car = init_parking_lot[1] + init_dist
-                init_heading_angle = np.random.uniform(np.pi / 12 * 5, np.pi / 12 * 7)
+                init_heading_angle = rng.uniform(np.pi / 12 * 5, np.pi / 12 * 7)
             elif side == 2:
-                x_car = init_parking_lot[0] + random.uniform(-5, 5)
+                x_car = init_parking_lot[0] + rng.uniform(-5, 5)
                 y_car = init_parking_lot[1] - init_dist
-                init_heading_angle = np.random.uniform(-np.pi / 12 * 7, -np.pi / 12 * 5)
+                init_heading_angle = rng.uniform(-np.pi / 12 * 7, -np.pi / 12 * 5)
             elif side == 3:
                 x_car = init_parking_lot[0] + init_dist
-                y_car = init_parking_lot[1] + random.uniform(-5, 5)
-                init_heading_angle = np.random.uniform(-np.pi / 12, np.pi / 12)
+                y_car = init_parking_lot[1] + rng.uniform(-5, 5)
+                init_heading_angle = rng.uniform(-np.pi / 12, np.pi / 12)
             elif side == 4:
                 x_car = init_parking_lot[0] - init_dist
-                y_car = init_parking_lot[1] + random.uniform(-5, 5)
-                init_heading_angle = np.random.uniform(np.pi - np.pi / 12, np.pi + np.pi / 12)
+                y_car = init_parking_lot[1] + rng.uniform(-5, 5)
+                init_heading_angle = rng.uniform(np.pi - np.pi / 12, np.pi + np.pi / 12)
             else:
                 raise ValueError(f"Invalid side value: {side}. Valid values are from 1 to 4")
 
@@ -150,7 +151,7 @@ def set_init_position(side: int, parking_type: str, randomized=True):
                 }
             }
 
-            num_dict = str(random.randint(5, 9))
+            num_dict = str(rng.integers(5, 10))
             if side == 1:
                 init_heading_angle = HEADING_ANGLE[side][num_dict]
             elif side == 2:
@@ -170,9 +171,9 @@ def set_init_position(side: int, parking_type: str, randomized=True):
     elif parking_type == "parallel":
         if randomized:
             init_dist = 5  # random.uniform(5, 7.5)
-            x_car = init_parking_lot[0] + random.uniform(5,  10)
+            x_car = init_parking_lot[0] + rng.uniform(5,  10)
             y_car = init_parking_lot[1] + init_dist
-            init_heading_angle = np.random.uniform(np.pi / 6, np.pi / 3)
+            init_heading_angle = rng.uniform(np.pi / 6, np.pi / 3)
 
             return np.array([x_car, y_car]), init_parking_lot, init_heading_angle
 
@@ -22,6 +22,7 @@ COLORS = {
 GRID_SIZE = 20
 WINDOW_W, WINDOW_H = 800, 600
 PIXEL_TO_METER_SCALE = 0.05  # Define the scale as 1 pixel = 0.05 meters
+TEXT_CACHE_SIZE = 256  # the maximum number of rendered text lines kept for reuse
 
 # parameters for cars and parking lot in the parking environment
 '''
@@ -35,6 +36,11 @@ CAR_STRUCT = np.array([[+CAR_L / 2, +CAR_W / 2],
                        [-CAR_L / 2, -CAR_W / 2],
                        [-CAR_L / 2, +CAR_W / 2]],
                       dtype=np.float32)  # Coordinates adjusted for meters
+CAR_STRUCT_ROT = np.array([[+CAR_W / 2, +CAR_L / 2],
+                           [+CAR_W / 2, -CAR_L / 2],
+                           [-CAR_W / 2, -CAR_L / 2],
+                           [-CAR_W / 2, +CAR_L / 2]],
+                          dtype=np.float32)  # CAR_STRUCT rotated by 90 degrees
 
 WHEEL_L, WHEEL_W = 15 * PIXEL_TO_METER_SCALE, 7 * PIXEL_TO_METER_SCALE  # Wheel length and width in meters
 WHEEL_STRUCT = np.array([[+WHEEL_L / 2, +WHEEL_W / 2],
@@ -77,6 +83,19 @@ PERPENDICULAR_VERTICAL = np.array([
     [-CAR_L / 2 - 20 * PIXEL_TO_METER_SCALE, +CAR_W / 2 + 20 * PIXEL_TO_METER_SCALE]],
     dtype=np.float32)  # Adjusted for meters
 
+# the structures are shared by all the cars and parking lots, so they must not be modified in place
+CAR_STRUCT.flags.writeable = False
+CAR_STRUCT_ROT.flags.writeable = False
+PARALLEL_HORIZONTAL.flags.writeable = False
+PARALLEL_VERTICAL.flags.writeable = False
+PERPENDICULAR_HORIZONTAL.flags.writeable = False
+PERPENDICULAR_VERTICAL.flags.writeable = False
+
+# the largest distance from the center of a parking lot to its border along x or y
+PARKING_HALF_EXTENT = float(max(np.abs(struct).max() for struct in (PARALLEL_HORIZONTAL, PARALLEL_VERTICAL,
+                                                                     PERPENDICULAR_HORIZONTAL,
+                                                                     PERPENDICULAR_VERTICAL)))
+
 OFFSET_PARALLEL = 160 * PIXEL_TO_METER_SCALE
 OFFSET_PERPENDICULAR = 80 * PIXEL_TO_METER_SCALE
 '''
@@ -1,15 +1,227 @@
+import os
+import logging
 import numpy as np
-import random
+import numba as nb
 import pygame
 import math
 import gymnasium as gym
 from typing import Optional
 from sim_env.car import Car
-from sim_env.com_fcn import meters_to_pixels, draw_object
+from sim_env.com_fcn import meters_to_screen, draw_object
 from sim_env.parameters import *
 from sim_env.init_state import set_init_position
 
 
+# [a, δ] of the discrete actions
+_DISCRETE_ACTIONS = np.array([[1, 0],  # move forward
+                              [1, -PI / 6],  # move right forward
+                              [1, PI / 6],  # move left forward
+                              [-1, 0],  # move backward
+                              [-1, -PI / 6],  # move right backward
+                              [-1, PI / 6]],  # move left backward
+                             dtype=np.float32)
+_DISCRETE_ACTIONS.flags.writeable = False
+
+
+@nb.njit(cache=True, fastmath=True)
+def _normalized_state_njit(points, cx, cy, c, s, out):
+    """
+    Transform points from the global coordinate system to the local(car) coordinate system,
+    normalize them by MAX_DISTANCE and clip them in between -1 and 1, in a single pass.
+
+    Parameters:
+        points (np.ndarray): (N, 2) float32 array of global [x, y] positions
+        cx, cy (float): the center of the car
+        c, s (float): cos and sin of (heading angle of the car - PI / 2)
+        out (np.ndarray): (2N,) float32 array the flattened local [x, y] positions are written to
+    """
+    for i in range(points.shape[0]):
+        x = points[i, 0] - cx
+        y = points[i, 1] - cy
+        out[2 * i] = min(max((x * c + y * s) / MAX_DISTANCE, -1.0), 1.0)
+        out[2 * i + 1] = min(max((-x * s + y * c) / MAX_DISTANCE, -1.0), 1.0)
+
+
+# events returned by _reward_njit
+EVENT_NONE = 0
+EVENT_MAX_STEPS = 1
+EVENT_CROSS_BORDER = 2
+EVENT_MAX_DISTANCE = 3
+EVENT_COLLISION = 4
+EVENT_SUCCESS = 5
+EVENT_MESSAGES = {
+    EVENT_MAX_STEPS: "The maximum step reaches",
+    EVENT_CROSS_BORDER: "The car crossed the parking lot vertically/horizontally.",
+    EVENT_MAX_DISTANCE: f"The distance between the car and the parking is more than {MAX_DISTANCE} meters",
+    EVENT_COLLISION: "The car has a collision",
+    EVENT_SUCCESS: "successful parking",
+}
+
+
+@nb.njit(cache=True, fastmath=True)
+def _check_cross_border_njit(car_vertices, axis, sign, edge):
+    """
+    Return True if the car crosses the horizontal/vertical parking border, see Parking.check_cross_border
+
+    The border is given by BaseParking.get_cross_border, which is computed once per episode.
+    """
+    for j in range(car_vertices.shape[0]):
+        if sign * car_vertices[j, axis] < sign * edge:
+            return True
+    return False
+
+
+@nb.njit(cache=True, fastmath=True)
+def _check_max_distance_njit(parking_lot_vertices, car_loc):
+    """
+    Return True if any parking lot vertex is MAX_DISTANCE or more away from the car along x or y
+    """
+    for j in range(parking_lot_vertices.shape[0]):
+        if (abs(parking_lot_vertices[j, 0] - car_loc[0]) >= MAX_DISTANCE or
+                abs(parking_lot_vertices[j, 1] - car_loc[1]) >= MAX_DISTANCE):
+            return True
+    return False
+
+
+@nb.njit(cache=True, fastmath=True)
+def _check_collision_njit(car_vertices, static_mins, static_maxs):
+    """
+    Return True if any car vertex is within the bounding box of any static car
+    """
+    for k in range(static_mins.shape[0]):
+        for j in range(car_vertices.shape[0]):
+            if (static_mins[k, 0] <= car_vertices[j, 0] <= static_maxs[k, 0] and
+                    static_mins[k, 1] <= car_vertices[j, 1] <= static_maxs[k, 1]):
+                return True
+    return False
+
+
+@nb.njit(cache=True, fastmath=True)
+def _is_car_in_parking_lot_njit(car_vertices, parking_lot_vertices):
+    """
+    Return True if all the car vertices are within the parking lot
+    """
+    for j in range(car_vertices.shape[0]):
+        if not (parking_lot_vertices[2, 0] <= car_vertices[j, 0] <= parking_lot_vertices[0, 0] and
+                parking_lot_vertices[2, 1] <= car_vertices[j, 1] <= parking_lot_vertices[0, 1]):
+            return False
+    return True
+
+
+@nb.njit(cache=True, fastmath=True)
+def _is_parking_successful_njit(parking_lot, car_loc):
+    """
+    Return True if the center of the car is within CENTER_THRESHOLD of the center of the parking lot
+    """
+    return (abs(parking_lot[0] - car_loc[0]) <= CENTER_THRESHOLD and
+            abs(parking_lot[1] - car_loc[1]) <= CENTER_THRESHOLD)
+
+
+@nb.njit(cache=True, fastmath=True)
+def _calc_angle_penalty_njit(psi, parking_angles):
+    """
+    Return the penalty for the angle error against the closest of the parking angles, up to 0.5
+    """
+    angle_error = 2 * PI
+    for j in range(parking_angles.shape[0]):
+        angle_error = min(angle_error, abs((psi - parking_angles[j] + PI) % (2 * PI) - PI))
+    return min(0.5 * (angle_error / MAX_ANGLE_ERROR), 0.5)
+
+
+@nb.njit(cache=True, fastmath=True)
+def _reward_njit(run_steps, car_loc, psi, car_vertices, parking_lot, parking_lot_vertices, border_axis,
+                 border_sign, border_edge, static_mins, static_maxs, parking_angles):
+    """
+    Calculate the reward of a single car, the checks are done in the order of Parking._reward
+
+    Return:
+        reward (float), event (int): one of the EVENT_* values
+    """
+    # check the number of the step
+    if run_steps == MAX_STEPS:
+        return -1.0, EVENT_MAX_STEPS
+
+    # check the location
+    if _check_cross_border_njit(car_vertices, border_axis, border_sign, border_edge):
+        return -1.0, EVENT_CROSS_BORDER
+
+    if _check_max_distance_njit(parking_lot_vertices, car_loc):
+        return -1.0, EVENT_MAX_DISTANCE
+
+    # check a collision
+    if _check_collision_njit(car_vertices, static_mins, static_maxs):
+        return -1.0, EVENT_COLLISION
+
+    # check the parking
+    if _is_car_in_parking_lot_njit(car_vertices, parking_lot_vertices) and _is_parking_successful_njit(parking_lot,
+                                                                                                        car_loc):
+        return 1.0 - _calc_angle_penalty_njit(psi, parking_angles), EVENT_SUCCESS
+    return 0.0, EVENT_NONE
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def _step_batch(car_loc, psi, v, car_vertices, new_car_loc, new_psi, new_v, run_steps, parking_lot,
+                parking_lot_vertices, border_axis, border_sign, border_edge, static_mins, static_maxs, parking_angles):
+    """
+    Move the cars of a batch to their new state (see Car.kinematic_act_batched) and calculate their reward.
+
+    The car state arrays (car_loc, psi, v, car_vertices, run_steps) are updated in place.
+
+    Returns:
+        reward (np.ndarray): (N,)
+        terminated (np.ndarray): (N,)
+        truncated (np.ndarray): (N,)
+    """
+    n = car_loc.shape[0]
+    reward = np.zeros(n, dtype=np.float32)
+    terminated = np.zeros(n, dtype=np.bool_)
+    truncated = np.zeros(n, dtype=np.bool_)
+    for i in nb.prange(n):
+        car_loc[i, 0] = new_car_loc[i, 0]
+        car_loc[i, 1] = new_car_loc[i, 1]
+        psi[i] = new_psi[i]
+        v[i] = new_v[i]
+
+        c = np.cos(psi[i])
+        s = np.sin(psi[i])
+        for j in range(CAR_STRUCT.shape[0]):
+            car_vertices[i, j, 0] = CAR_STRUCT[j, 0] * c - CAR_STRUCT[j, 1] * s + car_loc[i, 0]
+            car_vertices[i, j, 1] = CAR_STRUCT[j, 0] * s + CAR_STRUCT[j, 1] * c + car_loc[i, 1]
+
+        run_steps[i] += 1
+        r, event = _reward_njit(run_steps[i], car_loc[i], psi[i], car_vertices[i], parking_lot[i],
+                                parking_lot_vertices[i], border_axis[i], border_sign[i], border_edge[i],
+                                static_mins[i], static_maxs[i], parking_angles[i])
+        reward[i] = r
+        terminated[i] = event != EVENT_NONE
+        truncated[i] = event == EVENT_MAX_STEPS
+    return reward, terminated, truncated
+
+
+def _warmup_kernels():
+    """
+    Compile (or load from the cache) the Numba kernels for the float32 batch arrays of BatchedParking
+    """
+    n = 1
+    car_loc = np.zeros((n, 2), dtype=np.float32)
+    psi = np.zeros(n, dtype=np.float32)
+    v = np.zeros(n, dtype=np.float32)
+    new_car_loc, new_psi, new_v = Car.kinematic_act_batched(car_loc, psi, v, np.zeros((n, 2), dtype=np.float32))
+    _step_batch(car_loc, psi, v, np.zeros((n, 4, 2), dtype=np.float32), new_car_loc, new_psi, new_v,
+                np.zeros(n, dtype=np.int64),
+                np.zeros((n, 2), dtype=np.float32), np.zeros((n, 4, 2), dtype=np.float32),
+                np.zeros(n, dtype=np.int64), np.ones(n, dtype=np.float32), np.zeros(n, dtype=np.float32),
+                np.zeros((n, 2, 2), dtype=np.float32), np.zeros((n, 2, 2), dtype=np.float32),
+                np.zeros((n, 2), dtype=np.float32))
+
+
+# set PARKING_ENV_NUMBA_WARMUP=1 to compile the kernels at import time instead of on the first step.
+# This starts Numba's worker threads, so start subprocesses with "spawn" (e.g. AsyncVectorEnv(context="spawn")),
+# forked children otherwise hang on exit.
+if os.environ.get("PARKING_ENV_NUMBA_WARMUP", "0") == "1":
+    _warmup_kernels()
+
+
 class Parking(gym.Env):
     """
     A Gymnasium environment for the parking simulation.
@@ -32,6 +244,9 @@ class Parking(gym.Env):
         "training_modes": ["on", "off"]
     }
 
+    # grid background shared by all the instances, keyed on (WINDOW_W, WINDOW_H, GRID_SIZE)
+    _grid_template = {}
+
     def __init__(self, env_config) -> None:
         """
         Initializes a parking instance.
@@ -61,6 +276,15 @@ class Parking(gym.Env):
             )
         self.training_mode = env_config["training_mode"]
 
+        # the episode results are logged at DEBUG level, the training mode does not log them at all
+        self._logger = logging.getLogger("parking_env")
+
+        # render only every n steps from step(), explicit render() calls are not affected
+        self.render_every_n_steps = env_config.get("render_every_n_steps", 1)
+        if not isinstance(self.render_every_n_steps, int) or self.render_every_n_steps < 1:
+            raise ValueError(
+                f"Invalid render_every_n_steps: {self.render_every_n_steps}. Valid values are positive integers")
+
         self.render_mode = env_config["render_mode"]
         self.parking_type = env_config["parking_type"]
         self.action_type = env_config["action_type"]
@@ -71,18 +295,29 @@ class Parking(gym.Env):
         elif self.action_type == "discrete":
             self.action_space = gym.spaces.Discrete(6)
 
+        # bounds and scale of the continuous actions, the clipped and scaled action is written to _action_buf
+        self._action_lo = np.array([-1, -1], dtype=np.float32)
+        self._action_hi = np.array([1, 1], dtype=np.float32)
+        self._action_scale = np.array([ACCELERATION_LIMIT, STEERING_LIMIT], dtype=np.float32)
+        self._action_buf = np.empty(2, dtype=np.float32)
+
         self.window = None
         self.surf = None
         self.surf_car = None
         self.surf_parkinglot = None
         self.surf_text = None
         self.clock = None
+        self.font = None
+        self._text_cache = {}
 
         if self.parking_type == "parallel":
             self.parking_strategy = ParallelParking()
         else:
             self.parking_strategy = PerpendicularParking()
 
+        # compile the transform kernel now so that the first step does not pay for it
+        _normalized_state_njit(np.zeros((5, 2), dtype=np.float32), 0.0, 0.0, 1.0, 0.0, np.empty(10, dtype=np.float32))
+
     def step(self, action):
         """
         Let the car(agent) take an action in the parking environment.
@@ -98,32 +333,24 @@ class Parking(gym.Env):
         """
         if action is not None:
             if self.action_type == "continuous":
-                action = np.clip(action, [-1, -1], [1, 1]) * [
-                    ACCELERATION_LIMIT,
-                    STEERING_LIMIT,
-                ]
+                np.clip(action, self._action_lo, self._action_hi, out=self._action_buf)
+                action = np.multiply(self._action_buf, self._action_scale, out=self._action_buf)
             if self.action_type == "discrete":
-                if action == 0:  # move forward
-                    action = np.array([1, 0])
-                elif action == 1:  # move right forward
-                    action = np.array([1, -np.pi/6])
-                elif action == 2:  # move left forward
-                    action = np.array([1, np.pi/6])
-                elif action == 3:  # move backward
-                    action = np.array([-1, 0])
-                elif action == 4:  # move right backward
-                    action = np.array([-1, -np.pi/6])
-                elif action == 5:  # move left backward
-                    action = np.array([-1, np.pi/6])
-                else:
+                # a whole float or a single element array is accepted like an int
+                action_id = int(np.asarray(action).item())
+                if action_id != action or not 0 <= action_id < len(_DISCRETE_ACTIONS):
                     raise ValueError(
                         f"Invalid action value: {action}. "
                         f"Valid values are from 0 to 5")
+                action = _DISCRETE_ACTIONS[action_id]
 
             self.car.loc_old = self.car.car_loc
             self.car.kinematic_act(action)
+            self._update_heading_trig()
 
-            if self.render_mode == "human":
+            # no one watches the training, so step() never renders in the training mode
+            if (self.render_mode == "human" and self.training_mode == "off"
+                    and self.run_steps % self.render_every_n_steps == 0):
                 self.render()
             reward = self._reward()
             self.state = self.get_normalized_state()
@@ -160,8 +387,10 @@ class Parking(gym.Env):
                 # Initialize the text display
                 if self.surf_text is None:
                     pygame.font.init()
-                    self.surf_text = pygame.Surface((WINDOW_W, WINDOW_H), flags=pygame.SRCALPHA)
-            font = pygame.font.SysFont('Times New Roman', 15)
+                    self.surf_text = pygame.Surface((WINDOW_W, WINDOW_H), flags=pygame.SRCALPHA).convert_alpha()
+            if self.font is None:
+                pygame.font.init()
+                self.font = pygame.font.SysFont('Times New Roman', 15)
             self.surf_text.fill((0, 0, 0, 0))
 
             # Initialize the parking lot surface
@@ -174,43 +403,47 @@ class Parking(gym.Env):
 
             # Initialize the car(agent)
             if self.surf_car is None:
-                self.surf_car = pygame.Surface((WINDOW_W, WINDOW_H), flags=pygame.SRCALPHA)
+                self.surf_car = pygame.Surface((WINDOW_W, WINDOW_H), flags=pygame.SRCALPHA).convert_alpha()
             self.surf_car.fill((0, 0, 0, 0))
 
             # draw the car(agent) movement
             self.car.draw_car(self.surf_car)
 
             # draw the car path
-            car_loc_old = meters_to_pixels(self.car.loc_old)
-            car_loc = meters_to_pixels(self.car.car_loc)
-            pygame.draw.line(self.surf_parkinglot, COLORS["BLACK"], car_loc_old, car_loc)
+            car_loc_old = meters_to_screen(self.car.loc_old)
+            car_loc = meters_to_screen(self.car.car_loc)
+            pygame.draw.line(self.surf_parkinglot, COLORS["BLACK"], car_loc_old.tolist(), car_loc.tolist())
 
             # display Multi-line text
-            text_str = (f"Car location: {self.car.car_loc}\nVelocity: {self.car.v}\n"
-                        f"Heading angle: {self.car.psi}\nDegree: {self.car.psi * (180 / PI)}")
+            # the values are rounded so that the rendered lines can be reused from the text cache
+            text_str = (f"Car location: {np.round(self.car.car_loc, 2)}\nVelocity: {self.car.v:.2f}\n"
+                        f"Heading angle: {self.car.psi:.2f}\nDegree: {self.car.psi * (180 / PI):.2f}")
             text_rect = pygame.Rect(400, 500, 100, 100)  # Define the rectangle area for text
-            self.draw_multiline_text(self.surf_text, text_str, COLORS["BLACK"], text_rect, font)
-
-            # Compose the final surface
-            surf = self.surf_parkinglot.copy()
-            surf.blit(self.surf_car, (0, 0))
-            surf = pygame.transform.flip(surf, False, True)
-            surf.blit(self.surf_text, (0, 0))
+            self.draw_multiline_text(self.surf_text, text_str, COLORS["BLACK"], text_rect, self.font)
 
             # Update the display
             pygame.event.pump()
             self.clock.tick(self.metadata["render_fps"])
             # assert self.window is not None
-            self.window.fill(COLORS["BLACK"])
-            self.window.blit(surf, (0, 0))
+            # Compose the final frame directly on the window, everything is already drawn in the screen coordinates
+            # (see meters_to_screen). The parking lot is opaque and covers the whole window, so the window
+            # is not cleared first
+            self.window.blits([(self.surf_parkinglot, (0, 0)), (self.surf_car, (0, 0)), (self.surf_text, (0, 0))],
+                              doreturn=False)
             pygame.display.flip()
 
-    @staticmethod
-    def draw_multiline_text(screen, text, color, rect, font, aa=False, bkg=None):
+    def draw_multiline_text(self, screen, text, color, rect, font, aa=False, bkg=None):
         lines = text.splitlines()
         rendered_lines = []
         for line in lines:
-            line_surface = font.render(line, aa, color, bkg)
+            key = (line, color, aa, bkg)
+            line_surface = self._text_cache.get(key)
+            if line_surface is None:
+                line_surface = font.render(line, aa, color, bkg)
+                # drop the oldest entry once the cache is full
+                if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                    del self._text_cache[next(iter(self._text_cache))]
+                self._text_cache[key] = line_surface
             rendered_lines.append(line_surface)
 
         y = rect.top
@@ -219,21 +452,36 @@ class Parking(gym.Env):
             screen.blit(line_surface, (rect.left, y))
             y += line_height  # Move y down to start the next line
 
-    @staticmethod
-    def _create_parking_surface():
-        surf_parkinglot = pygame.Surface((WINDOW_W, WINDOW_H), flags=pygame.SRCALPHA)
-        surf_parkinglot.fill(COLORS["WHITE"])
-        for x in range(0, WINDOW_W, GRID_SIZE):
-            pygame.draw.line(surf_parkinglot, COLORS["GRID_COLOR"], (x, 0), (x, WINDOW_H))
-        for y in range(0, WINDOW_H, GRID_SIZE):
-            pygame.draw.line(surf_parkinglot, COLORS["GRID_COLOR"], (0, y), (WINDOW_W, y))
-        return surf_parkinglot
+    @classmethod
+    def _create_parking_surface(cls):
+        """
+        Create the parking lot background with the grid lines.
+
+        The grid is drawn only once and cached on the class, each call returns a copy of it
+        so that the obstacles and the car path can be drawn on top.
+        """
+        key = (WINDOW_W, WINDOW_H, GRID_SIZE)
+        if key not in cls._grid_template:
+            # the background is opaque, so it is kept without the per-pixel alpha for the faster blits
+            surf_parkinglot = pygame.Surface((WINDOW_W, WINDOW_H)).convert()
+            surf_parkinglot.fill(COLORS["WHITE"])
+            surf_parkinglot.lock()
+            for x in range(0, WINDOW_W, GRID_SIZE):
+                pygame.draw.line(surf_parkinglot, COLORS["GRID_COLOR"], (x, 0), (x, WINDOW_H))
+            # the grid rows start from the bottom of the window, as the y axis points up
+            for y in range(WINDOW_H - 1, -1, -GRID_SIZE):
+                pygame.draw.line(surf_parkinglot, COLORS["GRID_COLOR"], (0, y), (WINDOW_W, y))
+            surf_parkinglot.unlock()
+            cls._grid_template[key] = surf_parkinglot
+        return cls._grid_template[key].copy()
 
     def _draw_static_obstacles(self):
+        self.surf_parkinglot.lock()
         for parking_lot_vertex in self.static_parking_lot_vertices:
             draw_object(self.surf_parkinglot, "YELLOW", parking_lot_vertex)
         for car_vertex in self.static_cars_vertices:
             draw_object(self.surf_parkinglot, "GREY", car_vertex)
+        self.surf_parkinglot.unlock()
 
     def reset(
             self,
@@ -243,27 +491,36 @@ class Parking(gym.Env):
         super().reset(seed=seed)
 
         # choose the side
-        self.side = self.parking_strategy.set_initial_loc()
+        self.side = self.parking_strategy.set_initial_loc(self.np_random)
 
         # set the initial positions
         if self.training_mode == "off":
-            self.parking_lot = self.parking_strategy.set_initial_parking_loc(self.side)
+            self.parking_lot = self.parking_strategy.set_initial_parking_loc(self.side, self.np_random)
             self.parking_lot_vertices = (self.parking_lot +
                                          self.parking_strategy.get_parking_struct(self.parking_type, self.side))
-            while True:
-                car_loc = self.parking_strategy.set_initial_car_loc(self.side, self.parking_lot)
-                if not self.check_max_distance(self.parking_lot_vertices, car_loc):
-                    break
-            self.car = Car(car_loc, self.parking_strategy.set_initial_heading(self.side))
+            car_loc = self.parking_strategy.set_initial_car_loc(self.side, self.parking_lot, self.np_random)
+            self.car = Car(car_loc, self.parking_strategy.set_initial_heading(self.side, self.np_random))
         else:  # for training
-            car_loc, self.parking_lot, heading_angle = set_init_position(self.side, self.parking_type, randomized=True)
+            car_loc, self.parking_lot, heading_angle = set_init_position(self.side, self.parking_type,
+                                                                         self.np_random, randomized=True)
             self.parking_lot_vertices = (self.parking_lot +
                                          self.parking_strategy.get_parking_struct(self.parking_type, self.side))
             self.car = Car(car_loc, heading_angle)
+        self._parking_lot_vertices_np = np.asarray(self.parking_lot_vertices, dtype=np.float32)
+        self._state_points = np.concatenate((self._parking_lot_vertices_np, self.parking_lot[None, :]),
+                                            dtype=np.float32)
+        self._state_buf = np.empty(10, dtype=np.float32)
+        self._update_heading_trig()
 
         self.car.loc_old = self.car.car_loc
         self.static_cars_vertices, self.static_parking_lot_vertices = self.parking_strategy.generate_static_obstacles(
             self.parking_lot, self.side)
+        self._static_mins = self.static_cars_vertices.min(axis=1)
+        self._static_maxs = self.static_cars_vertices.max(axis=1)
+        # the side is fixed for the whole episode, so the side dependent values are computed only once
+        self._parking_angles = self.parking_strategy.get_parking_angle(self.parking_type, self.side)
+        self._cross_border_axis, self._cross_border_sign, self._cross_border_edge = \
+            self.parking_strategy.get_cross_border(self.side, self.parking_lot_vertices)
         self.state = self.get_normalized_state()
 
         self.terminated = False
@@ -289,133 +546,59 @@ class Parking(gym.Env):
                         and the distances to each parking lot vertex, clipped in between -1 and 1.
         """
 
-        # calculate the distance between the car and the parking lot vertices for the coordinate of the car
-        distances = []
-        for vertex in self.parking_lot_vertices:
-            distance = self.transform_point(vertex[0], vertex[1],
-                                            self.car.car_loc[0], self.car.car_loc[1], self.car.psi)
-            distances.append(distance)
-        distances = np.array(distances).flatten()
-
-        # normalization
-        # normalized_velocity = self.car.v / VELOCITY_LIMIT
-        normalized_distances = distances / MAX_DISTANCE
-
-        # guidance reward
-        guidance = self.transform_point(self.parking_lot[0], self.parking_lot[1],
-                                        self.car.car_loc[0], self.car.car_loc[1], self.car.psi)
-        normalized_guidance = guidance / MAX_DISTANCE
-
         # combine normalized state values
         # state = normalized_distances  # 8 elements
         # state = np.concatenate(([normalized_velocity], normalized_distances))  # 9 elements
 
-        # guidance reward
-        state = np.concatenate((normalized_distances, normalized_guidance))  # 10 elements
-
-        # clip the state value
-        state = np.clip(state, a_min=-1, a_max=1)
+        # calculate the distance between the car and the parking lot vertices (first 8 elements) and
+        # the guidance point (last 2 elements) for the coordinate of the car, normalized and clipped
+        # normalized_velocity = self.car.v / VELOCITY_LIMIT
+        _normalized_state_njit(self._state_points, self.car.car_loc[0], self.car.car_loc[1],
+                               self._cos_ang, self._sin_ang, self._state_buf)  # 10 elements
 
-        return state
+        # the caller may keep the returned state (e.g. RLlib's sample collection), so the buffer is not shared
+        return self._state_buf.copy()
 
-    @staticmethod
-    def transform_point(x, y, car_x, car_y, heading) -> np.array(['x', 'y']):
+    def _update_heading_trig(self):
         """
-        Transform the global coordinate system to the local(car) coordinate system
-
-        Return:
-            np.array: x,y coordinate system of the car
+        Calculate cos and sin of the rotation into the car coordinate system once per step
+        for get_normalized_state.
         """
-        # Translate the point to the new origin
-        x -= car_x
-        y -= car_y
-
-        # Rotate the point based on the heading
-        angle = heading - PI / 2
-        new_x = x * math.cos(-angle) - y * math.sin(-angle)
-        new_y = x * math.sin(-angle) + y * math.cos(-angle)
-
-        return np.array([new_x, new_y])
+        angle = self.car.psi - PI / 2
+        self._cos_ang = math.cos(angle)
+        self._sin_ang = math.sin(angle)
 
     def _reward(self) -> int:
         self.run_steps += 1
-        reward = 0
-
-        # check the number of the step
-        if self.run_steps == MAX_STEPS:
-            reward -= 1
-            self.truncated = True
-            self.terminated = True
-            print("The maximum step reaches")
-            return reward
-
-        # check the location
-        if self.check_cross_border():
-            reward -= 1
-            self.terminated = True
-            print("The car crossed the parking lot vertically/horizontally.")
-            return reward
-
-        if self.check_max_distance(self.parking_lot_vertices, self.car.car_loc):
-            reward -= 1
+        reward, event = _reward_njit(self.run_steps, self.car.car_loc, self.car.psi, self.car.car_vertices,
+                                     self.parking_lot, self.parking_lot_vertices, self._cross_border_axis,
+                                     self._cross_border_sign, self._cross_border_edge,
+                                     self._static_mins, self._static_maxs, self._parking_angles)
+        if event != EVENT_NONE:
             self.terminated = True
-            print("The distance between the car and the parking is more than",  MAX_DISTANCE, "meters")
-            return reward
-
-        # check a collision
-        if self.check_collision():
-            reward -= 1
-            self.terminated = True
-            print("The car has a collision")
-            return reward
-
-        # check the parking
-        if self.is_car_in_parking_lot():
-            if self.is_parking_successful():
-                reward += 1
-                self.terminated = True
-                print("successful parking")
-
-                parking_angle = self.get_parking_angle()
-                angle_penalty = self.calc_angle_dif(self.car.psi, parking_angle)
-
-                # Adjust reward
-                reward -= angle_penalty
-                return reward
+            if event == EVENT_MAX_STEPS:
+                self.truncated = True
+            if self.training_mode == "off":
+                self._logger.debug(EVENT_MESSAGES[event])
         return reward
 
     def is_parking_successful(self):
-        distance = abs(self.parking_lot - self.car.car_loc)
-        if distance[0] <= CENTER_THRESHOLD and distance[1] <= CENTER_THRESHOLD:
-            return True
-        return False
-
-    def get_parking_angle(self):
-        if self.parking_type == "perpendicular":
-            if self.side == 1:
-                return np.pi / 2
-            elif self.side == 2:
-                return -np.pi / 2
-            elif self.side == 3:
-                return 0
-            elif self.side == 4:
-                return np.pi
-        elif self.parking_type == "parallel":
-            if self.side in [1, 2]:
-                return [0, np.pi]  # Car can face either 0 or pi
-            elif self.side in [3, 4]:
-                return [np.pi / 2, -np.pi / 2]  # Car can face either pi/2 or -pi/2
+        return _is_parking_successful_njit(self.parking_lot, self.car.car_loc)
+
+    def get_parking_angle(self) -> np.ndarray:
+        """
+        Get the heading angles the car may have in the parking lot.
+
+        Returns:
+            np.ndarray: (1,) float32 for the perpendicular parking, (2,) float32 for the parallel parking
+                        since the car can face either way.
+        """
+        return self._parking_angles
 
     @staticmethod
-    def calc_angle_dif(psi, parking_angle):
-        # calculate the angle error
-        if isinstance(parking_angle, list):
-            angle_errors = [np.abs((psi - angle + PI) % (2 * PI) - PI) for angle in parking_angle]
-            angle_error = min(angle_errors)
-        else:
-            angle_error = np.abs((psi - parking_angle + PI) % (2 * PI) - PI)
-        angle_penalty = min(0.5 * (angle_error / MAX_ANGLE_ERROR), 0.5)
-        return angle_penalty
+    def calc_angle_dif(psi, parking_angles):
+        # calculate the angle penalty against the closest of the parking angles
+        return _calc_angle_penalty_njit(psi, np.asarray(parking_angles, dtype=np.float32).reshape(-1))
 
     def check_cross_border(self) -> bool:
         """
@@ -423,39 +606,15 @@ class Parking(gym.Env):
 
         Return True if the car cross the horizontal/vertical parking border
         """
-        # get each parking lot and car vertices
-        pa_top_right, pa_bottom_right, pa_bottom_left, pa_top_left = self.parking_lot_vertices
-
-        # Define the edges of the parking lot and car
-        pa_left_edge = pa_top_left[0]
-        pa_right_edge = pa_top_right[0]
-        pa_top_edge = pa_top_left[1]
-        pa_bottom_edge = pa_bottom_left[1]
-
-        if self.side == 1:
-            return np.any(self.car.car_vertices[:, 1] < pa_bottom_edge)
-        elif self.side == 2:
-            return np.any(self.car.car_vertices[:, 1] > pa_top_edge)
-        elif self.side == 3:
-            return np.any(self.car.car_vertices[:, 0] < pa_left_edge)
-        else:
-            return np.any(self.car.car_vertices[:, 0] > pa_right_edge)
+        return _check_cross_border_njit(self.car.car_vertices, self._cross_border_axis, self._cross_border_sign,
+                                        self._cross_border_edge)
 
     def is_car_in_parking_lot(self) -> bool:
-        xy1, xy2, xy3, xy4 = self.parking_lot_vertices
         # Check if all car corners are within the parking area
-        for corner in self.car.car_vertices:
-            if not self.check_boundary(xy1, xy3, corner):
-                return False
-        return True
+        return _is_car_in_parking_lot_njit(self.car.car_vertices, self.parking_lot_vertices)
 
     def check_collision(self) -> bool:
-        for static_car_vertex in self.static_cars_vertices:
-            xy1, xy2, xy3, xy4 = static_car_vertex
-            for car_vertex in self.car.car_vertices:
-                if self.check_boundary(xy1, xy3, car_vertex):
-                    return True
-        return False
+        return _check_collision_njit(self.car.car_vertices, self._static_mins, self._static_maxs)
 
     @staticmethod
     def check_max_distance(parking_lot_vertices, car_loc) -> bool:
@@ -464,40 +623,274 @@ class Parking(gym.Env):
 
         Return: True if it is more than 25 meters
         """
-        for parking_lot in parking_lot_vertices:
-            if (abs(parking_lot[0] - car_loc[0]) >= MAX_DISTANCE or
-                    abs(parking_lot[1] - car_loc[1]) >= MAX_DISTANCE):
-                return True
-        return False
+        return _check_max_distance_njit(parking_lot_vertices, car_loc)
 
-    @staticmethod
-    def check_boundary(xy1, xy2, obj) -> bool:
+    def close(self):
+        if self.window is not None:
+            pygame.display.quit()
+            pygame.quit()
+            self.window = None
+            self.font = None
+            self._text_cache.clear()
+
+
+def make_parking(env_config) -> Parking:
+    """
+    Create a parking environment, e.g. as the env_fns for gym.vector.SyncVectorEnv/AsyncVectorEnv.
+
+    Parameters:
+        env_config: contains the action type, render mode and parking type
+
+    Returns:
+        Parking: a new parking environment
+    """
+    return Parking(env_config)
+
+
+# gymnasium 1.0 reworked VectorEnv: the spaces are no longer passed to VectorEnv.__init__
+# and the last observation of an episode is reported as "final_obs" instead of "final_observation"
+_GYM_LEGACY_VECTOR = int(gym.__version__.split(".")[0]) < 1
+
+
+class BatchedParking(gym.vector.VectorEnv):
+    """
+    A vectorized parking environment which keeps N cars in (N, ...) arrays and steps all of them at once
+    with the _step_batch Numba kernel, parallelized over the environments.
+
+    Unlike gym.vector.SyncVectorEnv over N Parking instances, there is no per-environment Python call
+    in step(). An environment that terminates or truncates is reset in the same call to step(), like
+    SyncVectorEnv of gymnasium 0.28 (the "same step" autoreset). The returned state is then the initial state
+    of the new episode, the last state of the finished episode is in info["final_observation"]
+    (info["final_obs"] for gymnasium >= 1.0) and its info is in info["final_info"].
+    Only "no_render" is supported.
+
+    Attributes:
+        car_loc (np.ndarray): (N, 2) the center of each car
+        psi (np.ndarray): (N,) the heading angle of each car
+        v (np.ndarray): (N,) the velocity of each car
+        parking_lot (np.ndarray): (N, 2) the center of each parking lot
+        parking_lot_vertices (np.ndarray): (N, 4, 2) the vertices of each parking lot
+        static_cars_vertices (np.ndarray): (N, K, 4, 2) the vertices of the static cars
+    """
+
+    metadata = {
+        "render_modes": ["no_render"],
+        "action_types": ["continuous", "discrete"],
+        "parking_types": ["parallel", "perpendicular"],
+        "training_modes": ["on", "off"]
+    }
+
+    def __init__(self, env_config, num_envs: int) -> None:
+        """
+        Initializes a batch of parking instances.
+
+        Parameters:
+            env_config: contains the action type, render mode and parking type
+            num_envs (int): the number of the environments N
+        """
+        if env_config["render_mode"] not in self.metadata["render_modes"]:
+            raise ValueError(
+                f"Invalid render mode: {env_config['render_mode']}. Valid options are {self.metadata['render_modes']}")
+
+        if env_config["parking_type"] not in self.metadata["parking_types"]:
+            raise ValueError(
+                f"Invalid parking type: {env_config['parking_type']}. "
+                f"Valid options are {self.metadata['parking_types']}")
+
+        if env_config["action_type"] not in self.metadata["action_types"]:
+            raise ValueError(
+                f"Invalid action type: {env_config['action_type']}. Valid options are {self.metadata['action_types']}")
+
+        if env_config["training_mode"] not in self.metadata["training_modes"]:
+            raise ValueError(
+                f"Invalid training mode: {env_config['training_mode']}. "
+                f"Valid options are {self.metadata['training_modes']}"
+            )
+
+        self.render_mode = env_config["render_mode"]
+        self.parking_type = env_config["parking_type"]
+        self.action_type = env_config["action_type"]
+        self.training_mode = env_config["training_mode"]
+
+        single_observation_space = gym.spaces.Box(low=-1, high=1, shape=(10,), dtype=np.float32)
+        if self.action_type == "continuous":
+            single_action_space = gym.spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32)
+        else:
+            single_action_space = gym.spaces.Discrete(6)
+        if _GYM_LEGACY_VECTOR:
+            super().__init__(num_envs, single_observation_space, single_action_space)
+        else:
+            super().__init__()
+            self.metadata = {**self.metadata, "autoreset_mode": gym.vector.AutoresetMode.SAME_STEP}
+        self.num_envs = num_envs
+        self.single_observation_space = single_observation_space
+        self.single_action_space = single_action_space
+        self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, num_envs)
+        self.action_space = gym.vector.utils.batch_space(self.single_action_space, num_envs)
+        self._action_lo = np.array([-1, -1], dtype=np.float32)
+        self._action_hi = np.array([1, 1], dtype=np.float32)
+        self._action_scale = np.array([ACCELERATION_LIMIT, STEERING_LIMIT], dtype=np.float32)
+
+        if self.parking_type == "parallel":
+            self.parking_strategy = ParallelParking()
+        else:
+            self.parking_strategy = PerpendicularParking()
+
+        n = num_envs
+        k = 2  # the number of the static cars
+        self.car_loc = np.zeros((n, 2), dtype=np.float32)
+        self.psi = np.zeros(n, dtype=np.float32)
+        self.v = np.zeros(n, dtype=np.float32)
+        self.car_vertices = np.zeros((n, 4, 2), dtype=np.float32)
+        self.side = np.zeros(n, dtype=np.int64)
+        self.parking_lot = np.zeros((n, 2), dtype=np.float32)
+        self.parking_lot_vertices = np.zeros((n, 4, 2), dtype=np.float32)
+        self.parking_angles = np.zeros((n, 2), dtype=np.float32)
+        self.static_cars_vertices = np.zeros((n, k, 4, 2), dtype=np.float32)
+        self.run_steps = np.zeros(n, dtype=np.int64)
+
+        # precomputed per reset: the static car bounding boxes and the parking border (see BaseParking.get_cross_border)
+        self._static_mins = np.zeros((n, k, 2), dtype=np.float32)
+        self._static_maxs = np.zeros((n, k, 2), dtype=np.float32)
+        self._cross_border_axis = np.zeros(n, dtype=np.int64)
+        self._cross_border_sign = np.zeros(n, dtype=np.float32)
+        self._cross_border_edge = np.zeros(n, dtype=np.float32)
+
+    def reset(
+            self,
+            seed: Optional[int] = None,
+            options: Optional[dict] = None,
+    ):
+        if seed is not None:
+            self._np_random, _ = gym.utils.seeding.np_random(seed)
+        self._reset_envs(np.arange(self.num_envs))
+        return self.get_normalized_state(), {}
+
+    def _reset_envs(self, env_ids):
+        """
+        Set new initial positions for the environments in env_ids.
+
+        Resets are rare compared to steps, so each environment is sampled with the same helpers as Parking.
+        """
+        rng = self.np_random
+        for i in env_ids:
+            side = self.parking_strategy.set_initial_loc(rng)
+            if self.training_mode == "off":
+                parking_lot = self.parking_strategy.set_initial_parking_loc(side, rng)
+                car_loc = self.parking_strategy.set_initial_car_loc(side, parking_lot, rng)
+                heading_angle = self.parking_strategy.set_initial_heading(side, rng)
+            else:  # for training
+                car_loc, parking_lot, heading_angle = set_init_position(side, self.parking_type, rng,
+                                                                        randomized=True)
+            parking_lot_vertices = parking_lot + self.parking_strategy.get_parking_struct(self.parking_type, side)
+
+            self.side[i] = side
+            self.car_loc[i] = car_loc
+            self.psi[i] = heading_angle
+            self.parking_lot[i] = parking_lot
+            self.parking_lot_vertices[i] = parking_lot_vertices
+            self.static_cars_vertices[i] = self.parking_strategy.generate_static_obstacles(parking_lot, side)[0]
+
+            # a single perpendicular angle is repeated to fill the (2,) row
+            self.parking_angles[i] = self.parking_strategy.get_parking_angle(self.parking_type, side)
+            self._cross_border_axis[i], self._cross_border_sign[i], self._cross_border_edge[i] = \
+                self.parking_strategy.get_cross_border(side, parking_lot_vertices)
+
+        self.v[env_ids] = 0.0
+        self.run_steps[env_ids] = 0
+        self._static_mins[env_ids] = self.static_cars_vertices[env_ids].min(axis=2)
+        self._static_maxs[env_ids] = self.static_cars_vertices[env_ids].max(axis=2)
+        self.car_vertices[env_ids] = self.calc_car_vertices(self.car_loc[env_ids], self.psi[env_ids])
+
+    def step(self, actions):
+        """
+        Let all the cars(agents) take an action in their parking environment.
+
+        Parameters:
+            actions (np.ndarray): (N, 2) [a, δ] for the continuous actions or (N,) for the discrete actions
+
+        Returns:
+            state (np.ndarray): (N, 10) the normalized states, the initial states for the reset environments
+            reward (np.ndarray): (N,)
+            terminated (np.ndarray): (N,)
+            truncated (np.ndarray): (N,)
+            info (dict): "step" for the running environments, "final_observation" (or "final_obs")
+                         and "final_info" for the reset environments, each with its "_" mask
         """
-        check if obj is in between xy1 and xy2
+        if self.action_type == "continuous":
+            actions = np.clip(actions, self._action_lo, self._action_hi, dtype=np.float32)
+            np.multiply(actions, self._action_scale, out=actions)
+        else:
+            actions = np.asarray(actions)
+            action_ids = actions.astype(np.int64)
+            if not np.all((action_ids == actions) & (actions >= 0) & (actions < len(_DISCRETE_ACTIONS))):
+                raise ValueError(
+                    f"Invalid action value: {actions}. "
+                    f"Valid values are from 0 to 5")
+            actions = _DISCRETE_ACTIONS[action_ids]
+
+        new_car_loc, new_psi, new_v = Car.kinematic_act_batched(self.car_loc, self.psi, self.v,
+                                                                np.ascontiguousarray(actions, dtype=np.float32))
+        reward, terminated, truncated = _step_batch(
+            self.car_loc, self.psi, self.v, self.car_vertices, new_car_loc, new_psi, new_v, self.run_steps,
+            self.parking_lot, self.parking_lot_vertices, self._cross_border_axis, self._cross_border_sign,
+            self._cross_border_edge, self._static_mins, self._static_maxs, self.parking_angles)
+
+        state = self.get_normalized_state()
+        done = terminated | truncated
+        info = {"step": self.run_steps.copy(), "_step": ~done}
+        reset_ids = np.flatnonzero(done)
+        if reset_ids.size:
+            # the finished environments are rare, so their infos are added one by one as SyncVectorEnv does
+            final_key = "final_observation" if _GYM_LEGACY_VECTOR else "final_obs"
+            for i in reset_ids:
+                info = self._add_info(info, {final_key: state[i].copy(), "final_info": {"step": info["step"][i]}}, i)
+            self._reset_envs(reset_ids)
+            state = self.get_normalized_state()
+
+        return state, reward, terminated, truncated, info
 
-        Parameter
-            xy1: top right (x,y) position
-            xy2: bottom left (x,y) position
-            obj: targeted object (x,y) position
+    @staticmethod
+    def calc_car_vertices(car_loc, psi) -> np.ndarray:
+        """
+        Calculate the car vertices of (N,) cars, see Car.calc_car_vertices
 
         Return:
-            bool
+            np.ndarray: (N, 4, 2) car vertices
         """
-        if xy2[0] <= obj[0] <= xy1[0] and xy2[1] <= obj[1] <= xy1[1]:
-            return True
-        return False
+        c = np.cos(psi)[:, None]
+        s = np.sin(psi)[:, None]
+        x = CAR_STRUCT[None, :, 0]
+        y = CAR_STRUCT[None, :, 1]
+        vertices = np.stack((x * c - y * s, x * s + y * c), axis=-1)
+        return (vertices + car_loc[:, None, :]).astype(np.float32)
+
+    def get_normalized_state(self) -> np.ndarray:
+        """
+        Vectorized version of Parking.get_normalized_state
 
-    def close(self):
-        if self.window is not None:
-            pygame.display.quit()
-            pygame.quit()
-            self.window = None
+        Returns:
+            np.ndarray: (N, 10) the distances to each parking lot vertex and the guidance point
+                        in the coordinate of each car, normalized and clipped in between -1 and 1.
+        """
+        points = np.concatenate((self.parking_lot_vertices, self.parking_lot[:, None, :]), axis=1)
+        rel = points - self.car_loc[:, None, :]
+        angle = self.psi - PI / 2
+        c = np.cos(angle)[:, None]
+        s = np.sin(angle)[:, None]
+        local = np.stack((rel[..., 0] * c + rel[..., 1] * s, -rel[..., 0] * s + rel[..., 1] * c), axis=-1)
+        state = local.reshape(self.num_envs, 10).astype(np.float32) / np.float32(MAX_DISTANCE)
+        np.clip(state, -1, 1, out=state)
+        return state
+
+    def close(self, **kwargs):
+        self.closed = True
 
 
 class BaseParking:
     @staticmethod
-    def set_initial_loc():
-        return random.randint(1, 4)
+    def set_initial_loc(rng):
+        return int(rng.integers(1, 5))
 
     @staticmethod
     def get_parking_struct(parking_type: str, side: int):
@@ -517,6 +910,57 @@ class BaseParking:
         else:  # perpendicular
             return PERPENDICULAR_HORIZONTAL if side in [1, 2] else PERPENDICULAR_VERTICAL
 
+    @staticmethod
+    def get_parking_angle(parking_type: str, side: int) -> np.ndarray:
+        """
+        Get the heading angles the car may have in the parking lot.
+
+        Parameters:
+            parking_type (str): The type of parking arrangement.
+            side (int): The side of the parking lot
+
+        Returns:
+            np.ndarray: (1,) float32 for the perpendicular parking, (2,) float32 for the parallel parking
+                        since the car can face either way.
+        """
+        if parking_type == "perpendicular":
+            if side == 1:
+                return np.array([PI / 2], dtype=np.float32)
+            elif side == 2:
+                return np.array([-PI / 2], dtype=np.float32)
+            elif side == 3:
+                return np.array([0], dtype=np.float32)
+            else:
+                return np.array([PI], dtype=np.float32)
+        else:  # parallel
+            if side in [1, 2]:
+                return np.array([0, PI], dtype=np.float32)  # Car can face either 0 or pi
+            else:
+                return np.array([PI / 2, -PI / 2], dtype=np.float32)  # Car can face either pi/2 or -pi/2
+
+    @staticmethod
+    def get_cross_border(side: int, parking_lot_vertices):
+        """
+        Get the parking border the car must not cross.
+
+        A car vertex crosses the border if sign * vertex[axis] < sign * edge.
+
+        Parameters:
+            side (int): The side of the parking lot
+            parking_lot_vertices (np.ndarray): top right, bottom right, bottom left, top left vertices
+
+        Returns:
+            axis (int), sign (float), edge (float)
+        """
+        if side == 1:  # bottom edge
+            return 1, 1.0, float(parking_lot_vertices[2, 1])
+        elif side == 2:  # top edge
+            return 1, -1.0, float(parking_lot_vertices[3, 1])
+        elif side == 3:  # left edge
+            return 0, 1.0, float(parking_lot_vertices[3, 0])
+        else:  # right edge
+            return 0, -1.0, float(parking_lot_vertices[0, 0])
+
     @staticmethod
     def get_car_struct(parking_type: str, side: int):
         """
@@ -530,20 +974,12 @@ class BaseParking:
             np.ndarray: The vertices for parking space structure.
         """
         if parking_type == "parallel":
-            return CAR_STRUCT if side in [1, 2] else np.array([[+CAR_W / 2, +CAR_L / 2],
-                                                               [+CAR_W / 2, -CAR_L / 2],
-                                                               [-CAR_W / 2, -CAR_L / 2],
-                                                               [-CAR_W / 2, +CAR_L / 2]],
-                                                              dtype=np.float32)  # Coordinates adjusted for meters
+            return CAR_STRUCT if side in [1, 2] else CAR_STRUCT_ROT
         else:  # perpendicular
-            return CAR_STRUCT if side in [3, 4] else np.array([[+CAR_W / 2, +CAR_L / 2],
-                                                               [+CAR_W / 2, -CAR_L / 2],
-                                                               [-CAR_W / 2, -CAR_L / 2],
-                                                               [-CAR_W / 2, +CAR_L / 2]],
-                                                              dtype=np.float32)  # Coordinates adjusted for meters
+            return CAR_STRUCT if side in [3, 4] else CAR_STRUCT_ROT
 
     @staticmethod
-    def set_initial_car_loc(side, parking_loc) -> np.array(['x', 'y']):
+    def set_initial_car_loc(side, parking_loc, rng) -> np.array(['x', 'y']):
         """
         Set the initial car location
 
@@ -552,6 +988,8 @@ class BaseParking:
 
         parking_loc (np.array): The [x, y] location of the parking lot in meters.
 
+        rng (np.random.Generator): the random number generator of the environment
+
         side (int): determines on which side of the map the parking lot will be placed
                 - 1: the car is placed on the bottom side of the parking area.
                     x is randomly set between 100 and 700 pixels (before scaling),
@@ -572,23 +1010,28 @@ class BaseParking:
         """
         init_dist = 7.5  # random.uniform(7.5, 15)
 
+        # the offset along the parking lot keeps all its vertices closer than MAX_DISTANCE to the car,
+        # so that the location never needs to be resampled (see Parking.check_max_distance)
+        max_offset = min(5.0, MAX_DISTANCE - PARKING_HALF_EXTENT - 1e-3)
+        offset = rng.uniform(-max_offset, max_offset)
+
         if side == 1:
-            x_car = parking_loc[0] + random.uniform(-5, 5)
+            x_car = parking_loc[0] + offset
             y_car = parking_loc[1] + init_dist
         elif side == 2:
-            x_car = parking_loc[0] + random.uniform(-5, 5)
+            x_car = parking_loc[0] + offset
             y_car = parking_loc[1] - init_dist
         elif side == 3:
             x_car = parking_loc[0] + init_dist
-            y_car = parking_loc[1] + random.uniform(-5, 5)
+            y_car = parking_loc[1] + offset
         else:
             x_car = parking_loc[0] - init_dist
-            y_car = parking_loc[1] + random.uniform(-5, 5)
+            y_car = parking_loc[1] + offset
 
         return np.array([x_car, y_car])
 
     @staticmethod
-    def set_initial_parking_loc(side) -> np.array(['x', 'y']):
+    def set_initial_parking_loc(side, rng) -> np.array(['x', 'y']):
         """
         Set the initial parking lot location
 
@@ -604,36 +1047,38 @@ class BaseParking:
                 - 4: the parking lot is placed on the right side, x is set to 750 pixels (before scaling),
                     and y is randomly set between 100 and 500 pixels (before scaling).
 
+        rng (np.random.Generator): the random number generator of the environment
+
         Return:
             np.array:the center of the parking lot location [x,y]
         """
         if side == 1:
-            x_parking = random.uniform(100, WINDOW_W - 100) * PIXEL_TO_METER_SCALE
+            x_parking = rng.uniform(100, WINDOW_W - 100) * PIXEL_TO_METER_SCALE
             y_parking = 50 * PIXEL_TO_METER_SCALE
         elif side == 2:
-            x_parking = random.uniform(100, WINDOW_W - 100) * PIXEL_TO_METER_SCALE
+            x_parking = rng.uniform(100, WINDOW_W - 100) * PIXEL_TO_METER_SCALE
             y_parking = 550 * PIXEL_TO_METER_SCALE
         elif side == 3:
             x_parking = 50 * PIXEL_TO_METER_SCALE
-            y_parking = random.uniform(100, WINDOW_H - 100) * PIXEL_TO_METER_SCALE
+            y_parking = rng.uniform(100, WINDOW_H - 100) * PIXEL_TO_METER_SCALE
         else:
             x_parking = 750 * PIXEL_TO_METER_SCALE
-            y_parking = random.uniform(100, WINDOW_H - 100) * PIXEL_TO_METER_SCALE
+            y_parking = rng.uniform(100, WINDOW_H - 100) * PIXEL_TO_METER_SCALE
 
         return np.array([x_parking, y_parking])
 
 
 class ParallelParking(BaseParking):
     @staticmethod
-    def set_initial_heading(side):
+    def set_initial_heading(side, rng):
         if side == 1:
-            return np.random.uniform(PI / 12 * 5, PI / 12 * 7)
+            return rng.uniform(PI / 12 * 5, PI / 12 * 7)
         elif side == 2:
-            return np.random.uniform(-PI / 12 * 7, -PI / 12 * 5)
+            return rng.uniform(-PI / 12 * 7, -PI / 12 * 5)
         elif side == 3:
-            return np.random.uniform(-PI / 12, PI / 12)
+            return rng.uniform(-PI / 12, PI / 12)
         elif side == 4:
-            return np.random.uniform(-PI / 12 * 11, PI / 12 * 11)
+            return rng.uniform(-PI / 12 * 11, PI / 12 * 11)
         else:
             raise ValueError(f"Invalid side value: {side}. Valid values are from 1 to 4")
 
@@ -656,20 +1101,21 @@ class ParallelParking(BaseParking):
         for loc in static_cars_loc:
             static_cars_vertices.append(car_struct + loc)
             static_parking_vertices.append(parking_struct + loc)
-        return static_cars_vertices, static_parking_vertices
+        # (K, 4, 2) contiguous arrays of all the static obstacles
+        return np.stack(static_cars_vertices).astype(np.float32), np.stack(static_parking_vertices).astype(np.float32)
 
 
 class PerpendicularParking(BaseParking):
     @staticmethod
-    def set_initial_heading(side):
+    def set_initial_heading(side, rng):
         if side == 1:
-            return np.random.uniform(PI / 12 * 5, PI / 12 * 7)
+            return rng.uniform(PI / 12 * 5, PI / 12 * 7)
         elif side == 2:
-            return np.random.uniform(-PI / 12 * 7, -PI / 12 * 5)
+            return rng.uniform(-PI / 12 * 7, -PI / 12 * 5)
         elif side == 3:
-            return np.random.uniform(-PI / 12, PI / 12)
+            return rng.uniform(-PI / 12, PI / 12)
         elif side == 4:
-            return np.random.uniform(PI - PI / 12, PI + PI / 12)
+            return rng.uniform(PI - PI / 12, PI + PI / 12)
         else:
             raise ValueError(f"Invalid side value: {side}. Valid values are from 1 to 4")
 
@@ -692,4 +1138,5 @@ class PerpendicularParking(BaseParking):
         for loc in static_cars_loc:
             static_cars_vertices.append(car_struct + loc)
             static_parking_vertices.append(parking_struct + loc)
-        return static_cars_vertices, static_parking_vertices
+        # (K, 4, 2) contiguous arrays of all the static obstacles
+        return np.stack(static_cars_vertices).astype(np.float32), np.stack(static_parking_vertices).astype(np.float32)